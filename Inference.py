@@ -1,15 +1,94 @@
-import joblib
+import numpy as np
 import yfinance as yf
-import tensorflow as tf
-import pandas_ta as ta
-
-def predict_tomorrow_live(model='final_gold_model.keras', scaler_x_path='gold_scaler_X.pkl', scaler_y_path='gold_scaler_Y.pkl'):
-    # Load model
-    model = tf.keras.models.load_model(model, compile=False)
-    # 1. Load Scalers
-    scaler_X = joblib.load(scaler_x_path)
-    scaler_y = joblib.load(scaler_y_path)
-
+from numba import njit
+
+# Model input columns, in the order produced by compute_features, so a
+# prediction window is a plain integer slice of its output (no label lookups)
+feature_cols = ['Close', 'SMA_20', 'EMA_20', 'RSI_14', 'BBL_20', 'BBU_20', 'ATR_14']
+# Number of trailing days the model sees
+window_size = 29
+
+
+@njit(cache=True)
+def compute_features(close, high, low):
+    """
+    Compute the model features in a single pass over the Close/High/Low arrays.
+
+    Mirrors the pandas_ta indicators used in training: SMA_20, EMA_20 (SMA-seeded),
+    RSI_14 and ATR_14 (Wilder smoothing as pandas_ta's rma), and 2-std Bollinger
+    Bands over 20 rows (ddof=0). Returns an (n - 19, 7) array in `feature_cols`
+    order, starting at the first row where every indicator is defined.
+    """
+    n = close.shape[0]
+    out = np.empty((max(n - 19, 0), 7))
+    ema_alpha = 2.0 / 21.0
+    rma_decay = 1.0 - 1.0 / 14.0
+
+    win_sum = 0.0
+    win_sumsq = 0.0
+    ema = 0.0
+    # Numerators and shared denominator of the adjusted Wilder averages
+    gain_num = 0.0
+    loss_num = 0.0
+    tr_num = 0.0
+    rma_den = 0.0
+
+    for i in range(n):
+        c = close[i]
+        win_sum += c
+        win_sumsq += c * c
+        if i >= 20:
+            old = close[i - 20]
+            win_sum -= old
+            win_sumsq -= old * old
+
+        if i >= 1:
+            prev = close[i - 1]
+            diff = c - prev
+            tr = max(high[i] - low[i], abs(high[i] - prev), abs(prev - low[i]))
+            gain_num = max(diff, 0.0) + rma_decay * gain_num
+            loss_num = max(-diff, 0.0) + rma_decay * loss_num
+            tr_num = tr + rma_decay * tr_num
+            rma_den = 1.0 + rma_decay * rma_den
+
+        if i < 19:
+            continue
+
+        sma = win_sum / 20.0
+        std = np.sqrt(max(win_sumsq / 20.0 - sma * sma, 0.0))
+        if i == 19:
+            ema = sma
+        else:
+            ema = ema_alpha * c + (1.0 - ema_alpha) * ema
+        gain = gain_num / rma_den
+        loss = loss_num / rma_den
+
+        row = i - 19
+        out[row, 0] = c
+        out[row, 1] = sma
+        out[row, 2] = ema
+        out[row, 3] = 100.0 * gain / (gain + loss) if gain + loss > 0 else np.nan
+        out[row, 4] = sma - 2.0 * std
+        out[row, 5] = sma + 2.0 * std
+        out[row, 6] = tr_num / rma_den
+    return out
+
+
+def load_scalers(scalers_path='Model/gold_scalers.npz'):
+    """
+    Load the (scale, offset) vectors for X and y from the .npz written by export_scalers.py,
+    with transform(x) == x * scale + offset
+    """
+    with np.load(scalers_path) as scalers:
+        x_params = (scalers["x_scale"].astype(np.float32), scalers["x_offset"].astype(np.float32))
+        y_params = (scalers["y_scale"], scalers["y_offset"])
+    return x_params, y_params
+
+
+def predict_tomorrow_live(model, x_params, y_params):
+    # Model and scaler vectors (see load_scalers) are loaded once by the caller and passed in
+    x_scale, x_offset = x_params
+    y_scale, y_offset = y_params
     # 1. Fetch the last 60 days of data
     # (We fetch 60 to ensure we have enough rows to calculate 20-day SMAs/indicators)
     print("Fetching live market data...")
@@ -17,40 +96,25 @@ def predict_tomorrow_live(model='final_gold_model.keras', scaler_x_path='gold_sc
     live_data.columns = live_data.columns.get_level_values(0)
 
     # 2. Apply the exact same Feature Engineering as training
-    live_data["SMA_20"] = ta.sma(live_data['Close'], 20)
-
-    # Calculating EMA feature
-    live_data["EMA_20"] = ta.ema(live_data['Close'], 20)
-
-    # Calculating the RSI
-    live_data['RSI_14'] = ta.rsi(live_data['Close'], 14)
-
-    # calculating the Bbands
-    bb_cols = ("BBL_20", "BBM_20", "BBU_20", "BBB_20", "BBP_20")
-    # unpack the result into  dataframe
-    live_data[list(bb_cols)] = ta.bbands(live_data['Close'], length=20, std=2.0)
-
-    live_data['ATR_14'] = ta.atr(live_data['High'], live_data['Low'], live_data['Close'], length=14)
-
-    # 3. Drop rows with NaNs (the first 20 rows used for SMA calculation)
-    df_final = live_data.dropna()
+    # (SMA, EMA, RSI, Bollinger Bands and ATR in one pass; rows start once all are defined)
+    ohlc = live_data[['Close', 'High', 'Low']].dropna().to_numpy(dtype=np.float64)
+    features = compute_features(ohlc[:, 0], ohlc[:, 1], ohlc[:, 2])
 
-    # 2. Prepare the Input Window (Last 29 days)
-    feature_cols = ['Close', 'SMA_20', 'EMA_20', 'RSI_14', 'BBL_20', 'BBU_20', 'ATR_14']
-    last_window_raw = df_final[feature_cols].tail(29)
+    # 3. Prepare the Input Window (Last 29 days)
+    last_window_raw = features[-window_size:]
 
-    # 3. Scale and Reshape Input
-    last_window_scaled = scaler_X.transform(last_window_raw)
-    last_window_3d = last_window_scaled.reshape(1, 29, len(feature_cols))
+    # 4. Scale and Reshape Input
+    last_window_scaled = last_window_raw * x_scale + x_offset
+    last_window_3d = last_window_scaled.reshape(1, window_size, len(feature_cols))
 
-    # 4. Run Model Prediction
+    # 5. Run Model Prediction
     pred_scaled = model.predict(last_window_3d)
 
-    # 5. Inverse Transform the Result to USD
-    pred_usd = scaler_y.inverse_transform(pred_scaled)[0][0]
+    # 6. Inverse Transform the Result to USD
+    pred_usd = (pred_scaled[0][0] - y_offset[0]) / y_scale[0]
 
-    # 6. Directional Logic
-    current_price = df_final['Close'].iloc[-1]
+    # 7. Directional Logic
+    current_price = features[-1, 0]
     change = pred_usd - current_price
     direction = "BULLISH (UP)" if change > 0 else "BEARISH (DOWN)"
 
@@ -62,5 +126,7 @@ def predict_tomorrow_live(model='final_gold_model.keras', scaler_x_path='gold_sc
 
     return pred_usd
 
-# Usage (assuming df_final is your updated dataframe):
-# price_tomorrow = predict_tomorrow_live(df_final, model)
\ No newline at end of file
+# Usage (load the artifacts once and reuse them):
+# model = tf.keras.models.load_model('Model/final_gold_model.keras', compile=False)
+# x_params, y_params = load_scalers('Model/gold_scalers.npz')
+# price_tomorrow = predict_tomorrow_live(model, x_params, y_params)
\ No newline at end of file
@@ -1,12 +1,26 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
-import sys
+import asyncio
+import logging
+import threading
+import time
 import os
+import numpy as np
+import onnx
+import onnxruntime as ort
+import tensorflow as tf
+import yfinance as yf
+from curl_cffi import requests as cffi
+from onnxruntime.quantization import QuantType, quantize_dynamic
 
-# Import the prediction function from Inference.py
-from Inference import predict_tomorrow_live
+# Import the feature engineering and scaler loading shared with Inference.py
+from Inference import compute_features, feature_cols, load_scalers, window_size
+# ONNX conversion and the int8 accuracy check shared with the export_onnx.py script
+from export_onnx import QUANTIZATION_TOLERANCE, keras_to_onnx, quantization_deviation
+
+logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -24,11 +38,342 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Default model and scaler locations
+DEFAULT_MODEL_PATH = "Model/final_gold_model.keras"
+DEFAULT_SCALERS_PATH = "Model/gold_scalers.npz"  # written by export_scalers.py
+# Requests may only name artifacts inside this directory (the ONNX exports are written next to them)
+MODEL_DIR = os.path.realpath("Model")
+
+# How the LSTM is served: "onnx" (int8 ONNX Runtime), "xla", or "triton" (forwarded
+# to a Triton Inference Server, see triton/). When unset, ONNX is used and a failed
+# export falls back to XLA; an explicit INFERENCE_BACKEND=onnx fails instead.
+_REQUESTED_BACKEND = os.environ.get("INFERENCE_BACKEND")
+INFERENCE_BACKEND = (_REQUESTED_BACKEND or "onnx").lower()
+TRITON_URL = os.environ.get("TRITON_URL", "triton:8001")
+TRITON_MODEL_NAME = os.environ.get("TRITON_MODEL_NAME", "gold_lstm")
+
+# Loaded (infer, x_params, y_params) tuples, keyed by their resolved file paths,
+# oldest first; at most MAX_CACHED_ARTIFACTS are kept per process.
+# `infer` maps a float32 (batch, 29, 7) window to scaled (batch, 1) predictions;
+# the params are (scale, offset) pairs with transform(x) == x * scale + offset.
+MAX_CACHED_ARTIFACTS = 4
+_MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()
+
+def _is_fresh(path, source_path):
+    """
+    True if `path` exists and is at least as new as the file it was generated from
+    """
+    return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source_path)
+
+def _export_onnx(model, model_path):
+    """
+    Export the Keras model to ONNX next to the .keras file, reusing an
+    existing export as long as it is newer than the model
+    """
+    onnx_path = os.path.splitext(model_path)[0] + ".onnx"
+    if _is_fresh(onnx_path, model_path):
+        return onnx_path
+
+    onnx_model = keras_to_onnx(model)
+    # Write then rename, so concurrently booting workers never read a partial file
+    tmp_path = f"{onnx_path}.{os.getpid()}.tmp"
+    onnx.save(onnx_model, tmp_path)
+    os.replace(tmp_path, onnx_path)
+    return onnx_path
+
+def _quantize_onnx(onnx_path):
+    """
+    Quantize the ONNX export's weights to int8 (dynamic quantization), reusing an
+    existing quantized model as long as it is newer than the export
+    """
+    int8_path = os.path.splitext(onnx_path)[0] + ".int8.onnx"
+    if _is_fresh(int8_path, onnx_path):
+        return int8_path
+
+    tmp_path = f"{int8_path}.{os.getpid()}.tmp"
+    quantize_dynamic(onnx_path, tmp_path, weight_type=QuantType.QInt8)
+    os.replace(tmp_path, int8_path)
+    return int8_path
+
+def _onnx_infer(onnx_path):
+    """
+    Build an ONNX Runtime session for the exported model and return its infer function
+    """
+    sess_options = ort.SessionOptions()
+    sess_options.intra_op_num_threads = 1  # batch-1 serving
+    session = ort.InferenceSession(onnx_path, sess_options, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+
+    def infer(window_3d):
+        return session.run(None, {input_name: window_3d.astype(np.float32, copy=False)})[0]
+
+    return infer
+
+def _xla_infer(model):
+    """
+    Wrap the Keras model in an XLA-compiled tf.function and return its infer function
+    """
+    input_spec = tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32)
+
+    @tf.function(jit_compile=True, input_signature=[input_spec])
+    def forward(window_3d):
+        return model(window_3d, training=False)
+
+    def infer(window_3d):
+        return forward(tf.constant(window_3d, dtype=tf.float32)).numpy()
+
+    return infer
+
+def _triton_infer(url, model_name):
+    """
+    Forward windows to a Triton Inference Server over gRPC and return the infer function;
+    Triton's dynamic batching then batches them across all API workers
+    """
+    # Optional dependency, only needed for INFERENCE_BACKEND=triton
+    import tritonclient.grpc as grpcclient
+
+    client = grpcclient.InferenceServerClient(url)
+    # Tensor names come from the model metadata, looked up on the first call so
+    # the API can start before Triton is reachable
+    names = {}
+
+    def infer(window_3d):
+        if not names:
+            metadata = client.get_model_metadata(model_name, as_json=True)
+            names["input"] = metadata["inputs"][0]["name"]
+            names["output"] = metadata["outputs"][0]["name"]
+        inputs = grpcclient.InferInput(names["input"], list(window_3d.shape), "FP32")
+        inputs.set_data_from_numpy(window_3d.astype(np.float32, copy=False))
+        outputs = [grpcclient.InferRequestedOutput(names["output"])]
+        return client.infer(model_name, [inputs], outputs=outputs).as_numpy(names["output"])
+
+    return infer
+
+def _load_infer(model_path, x_params):
+    """
+    Load the model and serve its int8-quantized ONNX export with ONNX Runtime,
+    falling back to the FP32 export, then to XLA, if a step is not possible
+    """
+    if INFERENCE_BACKEND == "triton":
+        # The model lives in the Triton model repository, not in this process
+        return _triton_infer(TRITON_URL, TRITON_MODEL_NAME)
+
+    model = tf.keras.models.load_model(model_path, compile=False)
+    if INFERENCE_BACKEND == "xla":
+        return _xla_infer(model)
+
+    try:
+        onnx_path = _export_onnx(model, model_path)
+    except Exception as e:
+        if _REQUESTED_BACKEND is not None:
+            raise RuntimeError(f"ONNX export of {model_path} failed: {e}") from e
+        logger.error("ONNX export failed, serving %s with XLA: %s", model_path, e)
+        return _xla_infer(model)
+
+    try:
+        int8_path = _quantize_onnx(onnx_path)
+        # Only serve the int8 model if it stays close to FP32 on price-like windows
+        deviation = quantization_deviation(onnx_path, int8_path, x_params)
+    except Exception as e:
+        logger.warning("int8 quantization failed, serving the FP32 ONNX model: %s", e)
+        return _onnx_infer(onnx_path)
+
+    if deviation > QUANTIZATION_TOLERANCE:
+        logger.warning("int8 model deviates %.4g from FP32, serving the FP32 ONNX model", deviation)
+        return _onnx_infer(onnx_path)
+    logger.info("Serving the int8 ONNX model (max deviation %.4g from FP32, scaled units)", deviation)
+    return _onnx_infer(int8_path)
+
+def _get_artifacts(model_path, scalers_path):
+    """
+    Load the model and scalers once per process and reuse them across requests
+    """
+    key = (model_path, scalers_path)
+    # Lock-free fast path, so cache hits never wait behind another path's cold load
+    cached = _MODEL_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    with _MODEL_LOCK:
+        if key in _MODEL_CACHE:
+            return _MODEL_CACHE[key]
+
+        # Scalers first: a bad scalers_path fails fast, before the model is loaded and exported
+        x_params, y_params = load_scalers(scalers_path)
+
+        infer = _load_infer(model_path, x_params)
+        # Warm-up pass so tracing and thread-pool start-up are paid here, not by a request
+        try:
+            infer(np.zeros((1, window_size, len(feature_cols)), dtype=np.float32))
+        except Exception as e:
+            if INFERENCE_BACKEND != "triton":
+                raise
+            # Triton may still be starting; requests retry the connection themselves
+            logger.warning("Triton warm-up failed, continuing without it: %s", e)
+
+        if len(_MODEL_CACHE) >= MAX_CACHED_ARTIFACTS:
+            _MODEL_CACHE.pop(next(iter(_MODEL_CACHE)))
+        _MODEL_CACHE[key] = (infer, x_params, y_params)
+        return _MODEL_CACHE[key]
+
+def _resolve_artifact_path(path):
+    """
+    Resolve a requested artifact path, rejecting anything outside MODEL_DIR
+    """
+    if not path:
+        raise ValueError("Artifact paths must not be empty")
+    resolved = os.path.realpath(path)
+    if os.path.commonpath([resolved, MODEL_DIR]) != MODEL_DIR:
+        raise ValueError(f"Artifact paths must be inside {os.path.basename(MODEL_DIR)}/: {path}")
+    return resolved
+
+@app.on_event("startup")
+async def load_default_artifacts():
+    """
+    Load and warm up the default model and scalers so the first request is already hot
+    """
+    # Batch-1 serving is latency-bound; one intra-op thread avoids pool contention
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(1)
+    except RuntimeError:
+        pass  # TensorFlow was already initialized
+
+    _get_artifacts(_resolve_artifact_path(DEFAULT_MODEL_PATH), _resolve_artifact_path(DEFAULT_SCALERS_PATH))
+
+# Shared HTTP session, so TLS connections to Yahoo are reused across retries and days
+_YF_SESSION = cffi.Session(impersonate="chrome")
+
+# GC=F trades almost around the clock and the daily history includes the bar still
+# in progress, so the downloaded bars are only reused for BARS_TTL seconds
+BARS_TTL = 300
+
+# Latest GC=F daily bars as a (3, n) float64 array of Close/High/Low rows,
+# stored under the time.monotonic() timestamp they were fetched at
+_BARS = {}
+_BARS_LOCK = threading.Lock()
+
+def _get_bars():
+    """
+    Return the fetch time and the GC=F Close/High/Low arrays, downloading them
+    at most once per BARS_TTL seconds
+    """
+    with _BARS_LOCK:
+        fetched_at = next(iter(_BARS), None)
+        if fetched_at is None or time.monotonic() - fetched_at >= BARS_TTL:
+            live_data = _download_bars()
+
+            # Validate required columns exist
+            required_cols = ['Close', 'High', 'Low']
+            missing_cols = [col for col in required_cols if col not in live_data.columns]
+            if missing_cols:
+                raise ValueError(f"Missing required columns in market data: {missing_cols}")
+
+            # pandas is only used to parse the download; everything downstream is NumPy.
+            # float64 keeps the rolling sums in compute_features exact enough.
+            ohlc = live_data[required_cols].dropna().to_numpy(dtype=np.float64)
+            fetched_at = time.monotonic()
+            _BARS.clear()
+            _BARS[fetched_at] = np.ascontiguousarray(ohlc.T)
+        return fetched_at, _BARS[fetched_at]
+
+def _download_bars():
+    """
+    Download 90 days of GC=F daily bars, retrying only on transient JSON errors from Yahoo
+    """
+    ticker = yf.Ticker("GC=F", session=_YF_SESSION)
+    max_retries = 3
+    
+    for attempt in range(max_retries):
+        try:
+            live_data = ticker.history(period="90d", interval="1d", raise_errors=True)
+            break
+        except Exception as e:
+            error_msg = str(e)
+            error_type = type(e).__name__
+            
+            if "JSONDecodeError" not in error_type and "Expecting value" not in error_msg:
+                raise ValueError(f"Failed to download market data: {error_msg}")
+            if attempt < max_retries - 1:
+                wait_time = (attempt + 1) * 2  # Backoff: 2s, 4s
+                time.sleep(wait_time)
+                continue
+            raise ValueError(
+                "Failed to download market data: Yahoo Finance API returned invalid response (JSONDecodeError). "
+                "This may be due to rate limiting, API changes, or network issues. "
+                "Please try again in a few moments. If the issue persists, Yahoo Finance may be temporarily unavailable."
+            )
+    
+    if live_data.empty:
+        raise ValueError("Failed to download market data. The data source may be unavailable or the market may be closed.")
+
+    return live_data
+
+# Micro-batching: concurrent requests that arrive within BATCH_TIMEOUT seconds
+# of each other share a single forward pass
+BATCH_TIMEOUT = 0.01
+MAX_BATCH_SIZE = 32
+_BATCH_QUEUE = None
+_BATCH_TASK = None
+
+async def _batch_worker():
+    """
+    Collect queued (infer, window, future) items and answer them with one forward pass per model
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _BATCH_QUEUE.get()]
+        deadline = loop.time() + BATCH_TIMEOUT
+        while len(batch) < MAX_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_BATCH_QUEUE.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # Windows for different models cannot share a forward pass
+        groups = {}
+        for infer, window, future in batch:
+            groups.setdefault(infer, []).append((window, future))
+
+        for infer, items in groups.items():
+            try:
+                # Identical windows (the usual case) are only run once
+                windows = np.stack([window for window, _ in items])
+                unique_windows, inverse = np.unique(windows, axis=0, return_inverse=True)
+                preds = (await asyncio.to_thread(infer, unique_windows))[inverse.reshape(-1)]
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), pred in zip(items, preds):
+                if not future.done():
+                    future.set_result(pred)
+
+async def _predict_batched(infer, window):
+    """
+    Queue a single (29, 7) window for the batch worker and wait for its scaled prediction
+    """
+    future = asyncio.get_running_loop().create_future()
+    await _BATCH_QUEUE.put((infer, window, future))
+    return await future
+
+@app.on_event("startup")
+async def start_batch_worker():
+    """
+    Start the background task that batches concurrent predictions
+    """
+    global _BATCH_QUEUE, _BATCH_TASK
+    _BATCH_QUEUE = asyncio.Queue()
+    _BATCH_TASK = asyncio.create_task(_batch_worker())
+
 # Request model (optional, for future extensions)
 class PredictionRequest(BaseModel):
-    model_path: Optional[str] = "Model/final_gold_model.keras"
-    scaler_x_path: Optional[str] = "Model/gold_scaler_X.pkl"
-    scaler_y_path: Optional[str] = "Model/gold_scaler_Y.pkl"
+    model_path: Optional[str] = DEFAULT_MODEL_PATH
+    scalers_path: Optional[str] = DEFAULT_SCALERS_PATH
 
 # Response model
 class PredictionResponse(BaseModel):
@@ -59,15 +404,55 @@ async def health_check():
     """
     return {"status": "healthy"}
 
+def _prepare_window(model_path, scalers_path):
+    """
+    Blocking part of a prediction: load the artifacts, fetch the bars and
+    build the scaled (29, 7) input window
+    """
+    # Load model and scalers (cached after the first call)
+    infer, (x_scale, x_offset), y_params = _get_artifacts(model_path, scalers_path)
+
+    # Fetch live data (cached for BARS_TTL seconds after each download)
+    fetched_at, (close, high, low) = _get_bars()
+    
+    # Feature engineering (single pass; rows start once every indicator is defined)
+    features = compute_features(close, high, low)
+    
+    # Validate we have enough data after the indicator warm-up rows
+    if len(features) < window_size:
+        raise ValueError(f"Insufficient data: Need at least {window_size} rows, but only have {len(features)} rows after processing.")
+    
+    # Prepare input (float32, matching the model input) and validate it in one pass
+    last_window_array = np.ascontiguousarray(features[-window_size:], dtype=np.float32)
+    if last_window_array.shape != (window_size, len(feature_cols)):
+        raise ValueError(f"Data shape mismatch: Expected ({window_size}, {len(feature_cols)}), got {last_window_array.shape}")
+    if not np.isfinite(last_window_array).all():
+        raise ValueError("NaN or infinite values found in prediction window. Please check data quality.")
+    
+    # Scale
+    last_window_scaled = last_window_array * x_scale + x_offset
+
+    return infer, last_window_scaled, y_params, float(close[-1]), fetched_at
+
+# Finished (bars fetched_at, response) pairs, keyed by the resolved artifact paths.
+# A response is reused until the bars it was computed from are BARS_TTL seconds old.
+_RESPONSES = {}
+
+def _set_cache_control(response, fetched_at):
+    """
+    Let downstream caches keep a response only while the bars behind it are fresh
+    """
+    max_age = max(0, int(BARS_TTL - (time.monotonic() - fetched_at)))
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+
 @app.post("/api/predict", response_model=PredictionResponse)
-async def predict_gold_price(request: PredictionRequest = None):
+async def predict_gold_price(response: Response, request: PredictionRequest = None):
     """
     Predict tomorrow's gold price
     
     Parameters:
-    - model_path: Path to the trained model (default: Model/final_gold_model.keras)
-    - scaler_x_path: Path to X scaler (default: Model/gold_scaler_X.pkl)
-    - scaler_y_path: Path to Y scaler (default: Model/gold_scaler_Y.pkl)
+    - model_path: Path to the trained model inside Model/ (default: Model/final_gold_model.keras)
+    - scalers_path: Path to the X/y scaler vectors inside Model/ (default: Model/gold_scalers.npz)
     
     Returns:
     - current_price: Current gold price
@@ -75,185 +460,44 @@ async def predict_gold_price(request: PredictionRequest = None):
     - price_change: Expected change in price
     - direction: BULLISH (UP) or BEARISH (DOWN)
     """
+    # Use default paths if request is None
+    if request is None:
+        request = PredictionRequest()
     try:
-        # Use default paths if request is None
-        if request is None:
-            request = PredictionRequest()
-        
-        # Call the prediction function from Inference.py
-        # Note: We need to modify the function to return values instead of just printing
-        # For now, we'll capture the prediction
-        import io
-        from contextlib import redirect_stdout
-        
-        # Import required libraries for the prediction
-        import joblib
-        import yfinance as yf
-        import tensorflow as tf
-        import pandas_ta_classic as ta
-        import pandas as pd
-        
-        # Load model and scalers
-        model = tf.keras.models.load_model(request.model_path, compile=False)
-        scaler_X = joblib.load(request.scaler_x_path)
-        scaler_y = joblib.load(request.scaler_y_path)
-
-        # Fetch live data with retry logic and fallback methods
-        # Note: Let yfinance handle the session internally (it uses curl_cffi)
-        import time
-        max_retries = 3
-        live_data = None
-        
-        for attempt in range(max_retries):
-            try:
-                # Method 1: Try using yf.download (let YF handle session)
-                try:
-                    periods_to_try = ["90d", "60d", "30d"]
-                    for period in periods_to_try:
-                        try:
-                            live_data = yf.download(
-                                "GC=F", 
-                                period=period, 
-                                interval="1d", 
-                                progress=False
-                            )
-                            # Handle MultiIndex columns
-                            if isinstance(live_data.columns, pd.MultiIndex):
-                                live_data.columns = live_data.columns.get_level_values(0)
-                            
-                            if not live_data.empty and len(live_data) > 0:
-                                break
-                        except Exception as period_error:
-                            if period == periods_to_try[-1]:  # Last period attempt
-                                raise period_error
-                            continue
-                    
-                    if live_data is not None and not live_data.empty:
-                        break
-                        
-                except Exception as download_error:
-                    # Method 2: Fallback to using Ticker object (sometimes more reliable)
-                    try:
-                        ticker = yf.Ticker("GC=F")
-                        live_data = ticker.history(period="90d", interval="1d")
-                        if live_data.empty:
-                            live_data = ticker.history(period="60d", interval="1d")
-                        if live_data.empty:
-                            live_data = ticker.history(period="30d", interval="1d")
-                        
-                        if not live_data.empty:
-                            break
-                    except Exception as ticker_error:
-                        # If both methods fail, raise the original download error
-                        raise download_error
-                    
-            except Exception as e:
-                error_msg = str(e)
-                error_type = type(e).__name__
-                
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # Exponential backoff: 2s, 4s, 6s
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    if "JSONDecodeError" in error_type or "Expecting value" in error_msg:
-                        raise ValueError(
-                            "Failed to download market data: Yahoo Finance API returned invalid response (JSONDecodeError). "
-                            "This may be due to rate limiting, API changes, or network issues. "
-                            "Please try again in a few moments. If the issue persists, Yahoo Finance may be temporarily unavailable."
-                        )
-                    else:
-                        raise ValueError(f"Failed to download market data after {max_retries} attempts: {error_msg}")
-        
-        if live_data is None or live_data.empty:
-            raise ValueError("Failed to download market data: Received empty dataset from Yahoo Finance after all retry attempts.")
-        
-        # Validate data download
-        if live_data.empty:
-            raise ValueError("Failed to download market data. The data source may be unavailable or the market may be closed.")
-        
-        live_data.columns = live_data.columns.get_level_values(0)
-        
-        # Validate required columns exist
-        required_cols = ['Close', 'High', 'Low']
-        missing_cols = [col for col in required_cols if col not in live_data.columns]
-        if missing_cols:
-            raise ValueError(f"Missing required columns in market data: {missing_cols}")
-        
-        # Feature engineering
-        live_data["SMA_20"] = ta.sma(live_data['Close'], 20)
-        live_data["EMA_20"] = ta.ema(live_data['Close'], 20)
-        live_data['RSI_14'] = ta.rsi(live_data['Close'], 14)
-        
-        bb_cols = ("BBL_20", "BBM_20", "BBU_20", "BBB_20", "BBP_20")
-        live_data[list(bb_cols)] = ta.bbands(live_data['Close'], length=20, std=2.0)
-        live_data['ATR_14'] = ta.atr(live_data['High'], live_data['Low'], live_data['Close'], length=14)
-        
-        # Drop NaNs
-        df_final = live_data.dropna()
-        
-        # Validate we have enough data after dropping NaNs
-        if df_final.empty:
-            raise ValueError("No valid data available after processing. Market data may be incomplete.")
-        
-        if len(df_final) < 29:
-            raise ValueError(f"Insufficient data: Need at least 29 rows, but only have {len(df_final)} rows after processing.")
-        
-        # Prepare input
-        feature_cols = ['Close', 'SMA_20', 'EMA_20', 'RSI_14', 'BBL_20', 'BBU_20', 'ATR_14']
-        
-        # Validate all feature columns exist
-        missing_features = [col for col in feature_cols if col not in df_final.columns]
-        if missing_features:
-            raise ValueError(f"Missing feature columns: {missing_features}")
-        
-        last_window_raw = df_final[feature_cols].tail(29)
-        
-        # Validate the window has correct shape
-        if last_window_raw.empty or len(last_window_raw) < 29:
-            raise ValueError(f"Insufficient data for prediction window: Need 29 rows, got {len(last_window_raw)}")
-        
-        if last_window_raw.shape[1] != len(feature_cols):
-            raise ValueError(f"Feature dimension mismatch: Expected {len(feature_cols)} features, got {last_window_raw.shape[1]}")
-        
-        # Check for any NaN values in the window
-        if last_window_raw.isna().any().any():
-            raise ValueError("NaN values found in prediction window. Data preprocessing may be incomplete.")
-        
-        # Ensure all values are numeric and finite
-        if not last_window_raw.select_dtypes(include=['number']).shape[1] == len(feature_cols):
-            raise ValueError("Non-numeric values found in feature columns.")
-        
-        # Check for infinite values
-        numeric_data = last_window_raw.select_dtypes(include=['number'])
-        if (numeric_data == float('inf')).any().any() or (numeric_data == float('-inf')).any().any():
-            raise ValueError("Infinite values found in data. Please check data quality.")
-        
-        # Convert to numpy array and validate shape before scaling
-        last_window_array = last_window_raw.values
-        if last_window_array.shape != (29, len(feature_cols)):
-            raise ValueError(f"Data shape mismatch: Expected (29, {len(feature_cols)}), got {last_window_array.shape}")
+        paths = (_resolve_artifact_path(request.model_path), _resolve_artifact_path(request.scalers_path))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        # Serve a recent prediction if the bars behind it are still fresh
+        cached = _RESPONSES.get(paths)
+        if cached is not None and time.monotonic() - cached[0] < BARS_TTL:
+            _set_cache_control(response, cached[0])
+            return cached[1]
         
-        # Scale and reshape
-        last_window_scaled = scaler_X.transform(last_window_raw)
-        last_window_3d = last_window_scaled.reshape(1, 29, len(feature_cols))
+        # Blocking work (model load, download, features) runs in a worker thread
+        infer, last_window_scaled, (y_scale, y_offset), current_price, fetched_at = await asyncio.to_thread(
+            _prepare_window, *paths
+        )
         
-        # Predict
-        pred_scaled = model.predict(last_window_3d, verbose=0)
-        pred_usd = scaler_y.inverse_transform(pred_scaled)[0][0]
+        # Predict (batched with any concurrent requests)
+        pred_scaled = (await _predict_batched(infer, last_window_scaled)).reshape(1, -1)
+        pred_usd = float((pred_scaled[0, 0] - y_offset[0]) / y_scale[0])
         
-        # Calculate metrics
-        current_price = float(df_final['Close'].iloc[-1])
+        # Calculate metrics (unrounded; clients format prices for display)
         change = pred_usd - current_price
         direction = "BULLISH (UP)" if change > 0 else "BEARISH (DOWN)"
         
-        return PredictionResponse(
-            current_price=round(current_price, 2),
-            predicted_price=round(float(pred_usd), 2),
-            price_change=round(change, 2),
+        result = PredictionResponse(
+            current_price=current_price,
+            predicted_price=pred_usd,
+            price_change=change,
             direction=direction,
             status="success"
         )
+        _RESPONSES[paths] = (fetched_at, result)
+        _set_cache_control(response, fetched_at)
+        return result
         
     except FileNotFoundError as e:
         raise HTTPException(
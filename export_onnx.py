@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+import onnx
+import onnxruntime as ort
+import tensorflow as tf
+import tf2onnx
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+from Inference import compute_features, load_scalers, window_size
+
+# Largest int8-vs-FP32 difference (in scaled target units) accepted before serving
+# the quantized model; 0.01 is roughly $9.5 after inverse scaling
+QUANTIZATION_TOLERANCE = 0.01
+
+
+def keras_to_onnx(model):
+    """
+    Convert the Keras LSTM to an ONNX model with a float32 (batch, 29, 7) "window" input
+    """
+    input_signature = [tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32, name="window")]
+
+    # tf2onnx's from_keras does not understand Keras 3 models (TF >= 2.16),
+    # so trace the forward pass as a tf.function and convert that instead
+    @tf.function(input_signature=input_signature)
+    def forward(window_3d):
+        return model(window_3d, training=False)
+
+    onnx_model, _ = tf2onnx.convert.from_function(forward, input_signature=input_signature, opset=17)
+    return onnx_model
+
+
+def probe_windows(x_scale, x_offset, count=16):
+    """
+    Scaled (count, 29, 7) windows built from synthetic gold-price bars between
+    $1,100 and $4,800, covering the scaled range live inputs reach (about 0 to 4)
+    """
+    rng = np.random.default_rng(0)
+    windows = []
+    for start in np.linspace(1100.0, 4800.0, count):
+        close = start * np.exp(np.cumsum(rng.normal(0.0, 0.01, 3 * window_size)))
+        spread = close * rng.uniform(0.002, 0.015, close.shape)
+        windows.append(compute_features(close, close + spread, close - spread)[-window_size:])
+    return (np.asarray(windows) * x_scale + x_offset).astype(np.float32)
+
+
+def quantization_deviation(fp32_path, int8_path, x_params):
+    """
+    Largest |int8 - FP32| prediction difference (scaled target units) on the probe windows;
+    the int8 model should only be served when it is within QUANTIZATION_TOLERANCE
+    """
+    probe = probe_windows(*x_params)
+    predictions = []
+    for path in (fp32_path, int8_path):
+        session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        predictions.append(session.run(None, {session.get_inputs()[0].name: probe})[0])
+    return float(np.abs(predictions[1] - predictions[0]).max())
+
+
+def export_onnx(model_path='Model/final_gold_model.keras', output_path='triton/gold_lstm/1/model.onnx',
+                scalers_path='Model/gold_scalers.npz', quantize=True):
+    # Export the model for the Triton model repository (or any ONNX Runtime deployment),
+    # int8-quantized by default like the model the API serves itself, and kept in
+    # FP32 when quantization moves predictions by more than QUANTIZATION_TOLERANCE
+    model = tf.keras.models.load_model(model_path, compile=False)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
+    if quantize:
+        fp32_path = output_path + '.fp32'
+        onnx.save(keras_to_onnx(model), fp32_path)
+        quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QInt8)
+
+        x_params, _ = load_scalers(scalers_path)
+        deviation = quantization_deviation(fp32_path, output_path, x_params)
+        if deviation > QUANTIZATION_TOLERANCE:
+            print(f"int8 model deviates {deviation:.4g} from FP32, exporting the FP32 model instead")
+            os.replace(fp32_path, output_path)
+        else:
+            print(f"int8 model is within {deviation:.4g} of FP32 (scaled units)")
+            os.remove(fp32_path)
+    else:
+        onnx.save(keras_to_onnx(model), output_path)
+    print(f"Saved ONNX model to {output_path}")
+
+
+if __name__ == '__main__':
+    export_onnx()
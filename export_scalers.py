@@ -0,0 +1,35 @@
+import joblib
+import numpy as np
+
+
+def affine_params(scaler):
+    """
+    Reduce a fitted MinMaxScaler or StandardScaler to (scale, offset) vectors
+    with transform(x) == x * scale + offset
+    """
+    if hasattr(scaler, "min_"):
+        return scaler.scale_, scaler.min_
+    scale = 1.0 / scaler.scale_ if scaler.scale_ is not None else 1.0
+    offset = -scaler.mean_ * scale if scaler.mean_ is not None else 0.0
+    return scale, offset
+
+
+def export_scalers(scaler_x_path='Model/gold_scaler_X.pkl', scaler_y_path='Model/gold_scaler_Y.pkl',
+                   output_path='Model/gold_scalers.npz'):
+    # One-time conversion of the training scalers into the .npz the API loads,
+    # so serving needs neither joblib nor scikit-learn
+    x_scale, x_offset = affine_params(joblib.load(scaler_x_path))
+    y_scale, y_offset = affine_params(joblib.load(scaler_y_path))
+
+    np.savez(
+        output_path,
+        x_scale=np.asarray(x_scale, dtype=np.float64),
+        x_offset=np.asarray(x_offset, dtype=np.float64),
+        y_scale=np.asarray(y_scale, dtype=np.float64),
+        y_offset=np.asarray(y_offset, dtype=np.float64),
+    )
+    print(f"Saved scalers to {output_path}")
+
+
+if __name__ == '__main__':
+    export_scalers()
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pandas_ta_classic as ta
+
+from Inference import feature_cols
+
+
+def make_reference(output_path='tests/features_reference.npz', rows=120):
+    # Reference indicators for tests/test_features.py, computed with the pandas-ta-classic
+    # (0.3.14b1) calls compute_features replaced. Run from the repo root:
+    #   pip install pandas-ta-classic==0.3.14b1 && python -m tests.make_features_reference
+    rng = np.random.default_rng(0)
+    close = 2600 + np.cumsum(rng.normal(0, 15, rows))
+    close[60:] -= 80  # a gap down, so the RSI/ATR smoothing sees a large move
+    high = close + rng.uniform(0, 20, rows)
+    low = close - rng.uniform(0, 20, rows)
+
+    bars = pd.DataFrame({'Close': close, 'High': high, 'Low': low})
+    bars["SMA_20"] = ta.sma(bars['Close'], 20)
+    bars["EMA_20"] = ta.ema(bars['Close'], 20)
+    bars['RSI_14'] = ta.rsi(bars['Close'], 14)
+    bars[["BBL_20", "BBM_20", "BBU_20", "BBB_20", "BBP_20"]] = ta.bbands(bars['Close'], length=20, std=2.0)
+    bars['ATR_14'] = ta.atr(bars['High'], bars['Low'], bars['Close'], length=14)
+
+    np.savez(
+        output_path,
+        close=close,
+        high=high,
+        low=low,
+        features=bars.dropna()[feature_cols].to_numpy(dtype=np.float64),
+        pandas_ta_version=ta.version,
+    )
+    print(f"Saved reference features to {output_path}")
+
+
+if __name__ == '__main__':
+    make_reference()
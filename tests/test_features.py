@@ -0,0 +1,18 @@
+import os
+
+import numpy as np
+
+from Inference import compute_features
+
+REFERENCE_PATH = os.path.join(os.path.dirname(__file__), 'features_reference.npz')
+
+
+def test_compute_features_matches_pandas_ta():
+    # compute_features replaced the pandas-ta-classic (0.3.14b1) indicators the model was
+    # trained on; the stored reference is regenerated by tests/make_features_reference.py
+    with np.load(REFERENCE_PATH) as reference:
+        features = compute_features(reference['close'], reference['high'], reference['low'])
+        expected = reference['features']
+
+    assert features.shape == expected.shape
+    np.testing.assert_allclose(features, expected, rtol=1e-9, atol=1e-9)